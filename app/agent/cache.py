@@ -0,0 +1,152 @@
+"""
+Tool result cache - Redis-backed memoization for the paid external API tools
+
+Identical (city, place_type, query) style inputs recur across sessions, so
+repeat calls are served from Redis instead of SerpStack / Tavily / WebScraping.AI.
+Caching is disabled (pure pass-through) when REDIS_URL is not configured.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import orjson
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_sync_client = None
+_async_client = None
+
+
+def _get_sync_client():
+    """Lazily create the sync Redis client (None if caching is disabled)."""
+    global _sync_client
+    if not settings.redis_url:
+        return None
+    if _sync_client is None:
+        import redis
+        _sync_client = redis.Redis.from_url(settings.redis_url)
+    return _sync_client
+
+
+def _get_async_client():
+    """Lazily create the async Redis client (None if caching is disabled)."""
+    global _async_client
+    if not settings.redis_url:
+        return None
+    if _async_client is None:
+        import redis.asyncio as aioredis
+        _async_client = aioredis.Redis.from_url(settings.redis_url)
+    return _async_client
+
+
+def _normalize(value):
+    # Lists are kept verbatim: batched tools key their results by the caller's
+    # exact names, so a case-folded key would hand back another caller's keys.
+    if isinstance(value, str):
+        return value.strip().lower()
+    return value
+
+
+def make_cache_key(name: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    """Hash the tool name + normalized arguments (defaults applied) into a Redis key."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    normalized = {k: _normalize(v) for k, v in bound.arguments.items()}
+    payload = orjson.dumps({"fn": name, "args": normalized}, option=orjson.OPT_SORT_KEYS, default=str)
+    return f"tool:{name}:" + hashlib.blake2b(payload).hexdigest()
+
+
+def _is_cacheable(result) -> bool:
+    """
+    Never cache error / fallback payloads - they should be retried next time.
+
+    Tools with free-form str results (e.g. contact_shop_simulation) must raise
+    inside the cached function instead, since a str can't be told apart here.
+    """
+    if isinstance(result, dict):
+        if "error" in result or result.get("source") in ("error", "fallback"):
+            return False
+        # Tavily hands back its error text as a string instead of a result list
+        if "results" in result and not isinstance(result["results"], list):
+            return False
+        # Batched results: {place_name: per-place result}
+        return all(_is_cacheable(v) for v in result.values() if isinstance(v, dict))
+    if isinstance(result, list):
+        return not any(
+            (isinstance(r, dict) and ("error" in r or r.get("placeholder")))
+            or (isinstance(r, str) and r.startswith("Error"))
+            for r in result
+        )
+    return True
+
+
+def cached_tool(name: str, ttl: int):
+    """
+    Memoize a tool function in Redis.
+
+    Works for both sync and async functions. Sync/async variants of the same
+    tool should share `name` so they share cache entries.
+
+    Args:
+        name: Cache namespace (usually the tool name)
+        ttl: Expiry in seconds
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                client = _get_async_client()
+                if client is None:
+                    return await func(*args, **kwargs)
+
+                key = make_cache_key(name, signature, args, kwargs)
+                try:
+                    cached = await client.get(key)
+                    if cached is not None:
+                        logger.info("Cache hit for %s", name)
+                        return orjson.loads(cached)
+                except Exception as e:
+                    logger.warning("Redis get failed for %s: %s", name, e)
+
+                result = await func(*args, **kwargs)
+
+                if _is_cacheable(result):
+                    try:
+                        await client.set(key, orjson.dumps(result), ex=ttl)
+                    except Exception as e:
+                        logger.warning("Redis set failed for %s: %s", name, e)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            client = _get_sync_client()
+            if client is None:
+                return func(*args, **kwargs)
+
+            key = make_cache_key(name, signature, args, kwargs)
+            try:
+                cached = client.get(key)
+                if cached is not None:
+                    logger.info("Cache hit for %s", name)
+                    return orjson.loads(cached)
+            except Exception as e:
+                logger.warning("Redis get failed for %s: %s", name, e)
+
+            result = func(*args, **kwargs)
+
+            if _is_cacheable(result):
+                try:
+                    client.set(key, orjson.dumps(result), ex=ttl)
+                except Exception as e:
+                    logger.warning("Redis set failed for %s: %s", name, e)
+            return result
+
+        return wrapper
+
+    return decorator
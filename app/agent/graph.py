@@ -1,6 +1,7 @@
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from app.agent.state import AgentState
+from app.agent.serde import MsgspecSerializer
 from app.agent.nodes import (
     revisor_node,
     simple_best_reviewed_node,
@@ -84,7 +85,8 @@ def create_negotiator_agent():
     # ==========================================
     
     # Use MemorySaver - All state persisted automatically
-    checkpointer = MemorySaver()
+    # msgspec msgpack serde keeps per-node checkpoint writes cheap
+    checkpointer = MemorySaver(serde=MsgspecSerializer())
     
     # ==========================================
     # COMPILE GRAPH
@@ -10,12 +10,14 @@ STEP 5 Logic:
 
 from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from app.agent.state import AgentState
+from app.agent.state import AgentState, encode_field, get_serp_results, get_reviews
 from app.config import settings
 from pydantic import BaseModel, Field
 from typing import Literal
 import logging
 import json
+import asyncio
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +26,10 @@ logger = logging.getLogger(__name__)
 # HELPER: Get Groq LLM
 # ==========================================
 
+@lru_cache(maxsize=8)
 def get_llm(temperature: float = 0.3, use_key_2: bool = False):
     """
-    Get configured Groq LLM
+    Get configured Groq LLM (cached per temperature/key, so the client is reused)
     
     Args:
         temperature: LLM temperature (0-1)
@@ -80,7 +83,7 @@ async def revisor_node(state: AgentState) -> dict:
     # Get data from checkpoint memory
     user_query = state.get("user_query", "")
     user_intent = state.get("user_intent", "")
-    serp_results = state.get("serp_results", [])
+    serp_results = get_serp_results(state)
     parsed_params = state.get("parsed_params", {})
     
     llm = get_llm(temperature=0.3, use_key_2=True)  # Use API_KEY_2 for Revisor
@@ -178,7 +181,7 @@ async def simple_best_reviewed_node(state: AgentState) -> dict:
     
     logger.info("⭐ PATH A: Analyzing places...")
     
-    serp_results = state.get("serp_results", [])
+    serp_results = get_serp_results(state)
     show_all = state.get("show_all", False)  # Get revisor's decision
     
     if not serp_results:
@@ -279,7 +282,7 @@ async def negotiation_path_node(state: AgentState) -> dict:
     
     logger.info("🚧 PATH B: Negotiation workflow (Under construction)")
     
-    serp_results = state.get("serp_results", [])
+    serp_results = get_serp_results(state)
     user_intent = state.get("user_intent", "")
     
     # Extract phone numbers from SERPSTACK results
@@ -346,35 +349,34 @@ async def review_extraction_node(state: AgentState) -> dict:
     from app.agent.tools import fetch_reviews_webscraping_ai
     
     reviews_map = {}
-    updated_recommendations = []
     
-    for place in recommendations:
+    # Construct query for WebScraping.AI (name + address) per place
+    queries = [
+        f"{place.get('name', 'Unknown')} {place.get('address', '')}".strip()
+        for place in recommendations
+    ]
+    
+    logger.info(f"Fetching reviews for {len(queries)} places concurrently")
+    
+    # Fan out all fetches at once: wall time ~ slowest place instead of the sum
+    results = await asyncio.gather(
+        *[fetch_reviews_webscraping_ai.ainvoke({"query": query, "limit": 3}) for query in queries],
+        return_exceptions=True
+    )
+    
+    for place, reviews in zip(recommendations, results):
         name = place.get("name", "Unknown")
-        address = place.get("address", "")
-        
-        # Construct query for WebScraping.AI
-        query = f"{name} {address}".strip()
         
-        logger.info(f"Fetching reviews for: {name}")
-        
-        # Call the tool directly (it returns a list of strings)
-        # Note: In a real async environment, we might want to run these in parallel
-        try:
-            # The tool is decorated, so we invoke it
-            reviews = fetch_reviews_webscraping_ai.invoke({"query": query, "limit": 3})
-        except Exception as e:
-            logger.error(f"Failed to invoke fetch_reviews_webscraping_ai: {e}")
+        if isinstance(reviews, Exception):
+            logger.error(f"Failed to invoke fetch_reviews_webscraping_ai for {name}: {reviews}")
             reviews = ["Could not fetch reviews."]
             
         reviews_map[name] = reviews
-        
-        # Enrich recommendation with reviews
-        place["reviews_data"] = reviews
-        updated_recommendations.append(place)
-        
+    
+    # Reviews live only in the JSON-encoded "reviews" field (keyed by place name);
+    # recommendations are left as-is so they don't carry a second nested copy.
     return {
-        "reviews": reviews_map,
-        "recommendations": updated_recommendations
+        "reviews": encode_field(reviews_map)
     }
 
 
@@ -396,6 +398,8 @@ async def analyze_reviews_node(state: AgentState) -> dict:
     if not recommendations:
         return {"is_complete": True}
         
+    reviews_map = get_reviews(state)
+    
     # Prepare data for LLM
     candidates_data = []
     for place in recommendations:
@@ -403,7 +407,7 @@ async def analyze_reviews_node(state: AgentState) -> dict:
             "name": place.get("name"),
             "rating": place.get("rating"),
             "reviews_count": place.get("reviews_count"),
-            "reviews": place.get("reviews_data", [])
+            "reviews": reviews_map.get(place.get("name", "Unknown"), [])
         })
         
     llm = get_llm(temperature=0.2)
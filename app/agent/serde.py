@@ -0,0 +1,50 @@
+"""
+Checkpoint serializer - msgspec msgpack for plain state values
+
+Most AgentState channels are plain str/bool/list/dict values (bulky fields are
+already JSON strings), which msgspec encodes/decodes far faster than the
+default serializer. Everything else (LangChain messages, Send/Interrupt,
+tuples, enums, UUIDs, ...) goes to LangGraph's JsonPlusSerializer, which
+round-trips those types faithfully.
+"""
+
+import msgspec
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+MSGSPEC_TYPE = "msgspec"
+
+# Exact types only: subclasses (str/int Enums, bool-like ints, ...) must not
+# take the msgspec path since the untyped decoder would return the base type.
+_SCALAR_TYPES = (str, int, float, bool, type(None), bytes)
+
+
+def _is_plain(obj) -> bool:
+    """True if obj is only scalars and list/dict (str keys) of them."""
+    obj_type = type(obj)
+    if obj_type in _SCALAR_TYPES:
+        return True
+    if obj_type is list:
+        return all(_is_plain(v) for v in obj)
+    if obj_type is dict:
+        return all(type(k) is str and _is_plain(v) for k, v in obj.items())
+    return False
+
+
+class MsgspecSerializer(JsonPlusSerializer):
+    """JsonPlusSerializer that uses msgspec msgpack for plain JSON-like values."""
+
+    def __init__(self):
+        super().__init__()
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder()
+
+    def dumps_typed(self, obj) -> tuple[str, bytes]:
+        if _is_plain(obj):
+            return MSGSPEC_TYPE, self._encoder.encode(obj)
+        return super().dumps_typed(obj)
+
+    def loads_typed(self, data: tuple[str, bytes]):
+        type_, payload = data
+        if type_ == MSGSPEC_TYPE:
+            return self._decoder.decode(payload)
+        return super().loads_typed(data)
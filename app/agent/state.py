@@ -1,6 +1,7 @@
-from typing import TypedDict, Annotated
+from typing import TypedDict, Annotated, Any, Mapping
 from langgraph.graph.message import add_messages
 from langchain_core.messages import BaseMessage
+import orjson
 
 
 class AgentState(TypedDict):
@@ -22,9 +23,10 @@ class AgentState(TypedDict):
     budget: float | None
     
     # SERP & External Data
-    serp_results: list[dict]  # Raw SERP API results
-    tavily_reviews: list[dict]  # Tavily search results for reviews
-    reviews: dict[str, list[str]] # Detailed reviews for specific shops
+    # Bulky fields are stored as JSON strings (see encode_field / get_* helpers)
+    serp_results: str  # JSON-encoded list[dict]: Raw SERP API results
+    tavily_reviews: str  # JSON-encoded list[dict]: Tavily search results for reviews
+    reviews: str  # JSON-encoded dict[str, list[str]]: Detailed reviews for specific shops
     
     # Human-in-the-Loop
     human_approved: bool
@@ -36,9 +38,9 @@ class AgentState(TypedDict):
     current_step: str  # Current node in workflow
     
     # Analysis & Reflexion
-    initial_analysis: list[dict]  # First pass analysis
+    initial_analysis: str  # JSON-encoded list[dict]: First pass analysis
     shop_responses: list[dict]  # Simulated shop communications
-    refined_analysis: list[dict]  # After reflexion
+    refined_analysis: str  # JSON-encoded list[dict]: After reflexion
     iteration: int  # Reflexion loop counter
     
     # Final Output
@@ -47,3 +49,33 @@ class AgentState(TypedDict):
     
     # Metadata
     thread_id: str
+
+
+# ==========================================
+# JSON-encoded field helpers
+# ==========================================
+# Large nested results are kept as a single JSON string in state so every
+# checkpoint write stores one flat str instead of re-serializing deep dicts.
+# Producers encode once; consumers decode only where the parsed form is needed.
+
+def encode_field(value: Any) -> str:
+    """Encode a bulky state value (list/dict) as a JSON string."""
+    return orjson.dumps(value).decode()
+
+
+def decode_field(state: Mapping, key: str, default: Any) -> Any:
+    """Decode a JSON-encoded state field, tolerating already-decoded values."""
+    raw = state.get(key)
+    if not raw:
+        return default
+    if isinstance(raw, (str, bytes)):
+        return orjson.loads(raw)
+    return raw
+
+
+def get_serp_results(state: Mapping) -> list[dict]:
+    return decode_field(state, "serp_results", [])
+
+
+def get_reviews(state: Mapping) -> dict[str, list[str]]:
+    return decode_field(state, "reviews", {})
@@ -1,24 +1,225 @@
-from langchain_core.tools import tool
+from langchain_core.tools import tool, StructuredTool
 from langchain_community.tools.tavily_search import TavilySearchResults
-import requests
+import httpx
+import asyncio
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 from typing import Optional
 from app.config import settings
 from app.models import ShopResponse
-import json
+from app.agent.cache import cached_tool
+import orjson
 import logging
-from bs4 import BeautifulSoup
+import re
+import numpy as np
+import tiktoken
+from functools import lru_cache
+from selectolax.lexbor import LexborHTMLParser
+from rapidfuzz import fuzz, process, utils
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage
 
 logger = logging.getLogger(__name__)
 
+# Indian phone patterns: +91 XXXXX XXXXX or XXXXX XXXXX
+_PHONE_RE = re.compile(r'(\+91\s*\d{5}\s*\d{5}|\d{5}\s*\d{5})')
+# Rating + review count from text like "4.8(407)"
+_RATING_RE = re.compile(r'(\d+\.\d+)\((\d+)\)')
+# Address: text between business info and "Closed/Open"
+_ADDR_RE = re.compile(r'business\s*·\s*([^·]+?)(?:Closed|Open)')
+
+
+# ==========================================
+# Shared HTTP Clients (keep-alive pooling)
+# ==========================================
+
+# Reused across calls so SerpStack / WebScraping.AI requests skip the TCP+TLS handshake
+_HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+# follow_redirects matches requests.get, which the tools used before
+_http = httpx.AsyncClient(timeout=60, http2=True, limits=_HTTP_LIMITS, follow_redirects=True)
+_http_sync = httpx.Client(timeout=60, http2=True, limits=_HTTP_LIMITS, follow_redirects=True)
+
+
+async def close_http_clients():
+    """Close the pooled HTTP clients (called on app shutdown)."""
+    await _http.aclose()
+    _http_sync.close()
+
+
+# ==========================================
+# Shared LLM Clients
+# ==========================================
+
+# Constructed once per (model, temperature, json_mode) so repeated tool calls
+# reuse the client and its underlying HTTP connection pool.
+
+@lru_cache(maxsize=4)
+def _groq(model: str = "llama-3.3-70b-versatile", temperature: float = 0, json_mode: bool = False):
+    return ChatGroq(
+        model=model,
+        temperature=temperature,
+        api_key=settings.groq_api_key,
+        # JSON mode constrains decoding to a valid JSON object
+        model_kwargs={"response_format": {"type": "json_object"}} if json_mode else {}
+    )
+
+
+@lru_cache(maxsize=4)
+def _gemini(temperature: float = 0.8):
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    
+    return ChatGoogleGenerativeAI(
+        model=settings.llm_model,
+        temperature=temperature,
+        google_api_key=settings.google_api_key
+    )
+
 
 # ==========================================
 # SerpStack API Tool
 # ==========================================
 
-@tool
-def search_places(city: str, place_type: str, query: Optional[str] = None) -> list[dict]:
+def _serp_params(search_query: str) -> dict:
+    """SerpStack API parameters for a search query."""
+    return {
+        "access_key": settings.serp_api_key,
+        "query": search_query,
+        "type": "web",
+        # num bounds the organic results, which are sliced to 10 anyway.
+        # related_places is read unsliced for phone lookup (local pack block).
+        "num": 10,
+        "auto_location": 1, # Ensure auto-location is on
+        "google_domain": "google.co.in", # Use Google India for better local results
+        "gl": "in", # Country code for India
+        "hl": "en" # Language English
+    }
+
+
+def _extract_phone(text: str) -> str:
+    """Extract phone number from text like '+91 99885 93333' or '99885 93333'"""
+    if not text:
+        return ""
+    phone_match = _PHONE_RE.search(text)
+    return phone_match.group(1) if phone_match else ""
+
+
+def _local_place(place: dict, phone_mapping: dict[str, str], place_type: str) -> dict:
+    """Build a result from a local_results entry (best structured data)."""
+    place_name = place.get("title", "Unknown")
+    place_name_lower = place_name.lower().strip()
+    
+    if place_name_lower not in phone_mapping and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("No phone found in mapping for '%s'. Available keys: %s", place_name_lower, list(phone_mapping.keys()))
+    
+    # related_places mapping first, then fall back to "type" field, then address
+    phone = (
+        phone_mapping.get(place_name_lower)
+        or _extract_phone(place.get("type", ""))
+        or _extract_phone(place.get("address", ""))
+    )
+    
+    logger.info("Final phone for '%s': '%s'", place_name, phone)
+    
+    return {
+        "name": place_name,
+        "address": place.get("address", ""),
+        "phone": phone,
+        "rating": place.get("rating", None),
+        "reviews_count": place.get("reviews", 0),
+        "price_level": place.get("price", {}),
+        "type": place_type,
+        "extensions": place.get("extensions", {})
+    }
+
+
+def _related_place(place_obj: dict, place_type: str) -> dict:
+    """Build a result from a related_places entry (free text block)."""
+    place_text = place_obj.get("places") or ""
+    
+    # Extract rating from text like "4.8(407)"
+    rating_match = _RATING_RE.search(place_text)
+    
+    # Extract address (text between business info and "Closed/Open")
+    address_match = _ADDR_RE.search(place_text)
+    
+    return {
+        "name": place_obj.get("title", "Unknown"),
+        "address": address_match.group(1).strip() if address_match else "",
+        "phone": _extract_phone(place_text),
+        "rating": float(rating_match.group(1)) if rating_match else None,
+        "reviews_count": int(rating_match.group(2)) if rating_match else 0,
+        "price_level": {},
+        "type": place_type,
+        "extensions": {}
+    }
+
+
+def _organic_place(result: dict, position: int, place_type: str) -> dict:
+    """Build a result from an organic_results entry (last resort)."""
+    return {
+        "name": result.get("title", "Unknown"),
+        "address": result.get("snippet", "")[:100],
+        "phone": "",
+        "rating": None,
+        "reviews_count": 0,
+        "price_level": {},
+        "type": place_type,
+        "url": result.get("url", ""),
+        "position": position,
+        "extensions": {}
+    }
+
+
+def _parse_serp_results(data: dict, place_type: str, search_query: str) -> list[dict]:
+    """Turn a raw SerpStack response into the list of place dicts."""
+    # Check for API errors
+    if not data.get("request", {}).get("success", True):
+        error_info = data.get("error", {})
+        return [{"error": f"SerpStack API error: {error_info.get('info', 'Unknown error')}"}]
+    
+    related_places = data.get("related_places", [])
+    
+    # PRIORITY 1: Parse local_results (has best structured data)
+    if "local_results" in data:
+        # Map place titles to phone numbers from related_places (one regex search per entry).
+        # Only local_results consumes this, so it isn't built on the other branches.
+        phone_mapping = {
+            place_obj.get("title", "").lower().strip(): phone_match.group(1)
+            for place_obj in related_places
+            if (phone_match := _PHONE_RE.search(place_obj.get("places") or ""))
+        }
+        logger.info("Mapped %d phones from %d related_places", len(phone_mapping), len(related_places))
+        
+        logger.info("Processing %d local_results", len(data["local_results"]))
+        results = [_local_place(place, phone_mapping, place_type) for place in data["local_results"][:10]]
+    
+    # PRIORITY 2: Parse related_places (fallback if no local_results)
+    elif "related_places" in data:
+        results = [_related_place(place_obj, place_type) for place_obj in related_places[:10]]
+    
+    else:
+        results = []
+    
+    # PRIORITY 3: Parse organic_results (last resort)
+    if not results and "organic_results" in data:
+        results = [
+            _organic_place(result, idx, place_type)
+            for idx, result in enumerate(data["organic_results"][:10], 1)
+        ]
+    
+    # If no results found
+    if not results:
+        return [{
+            "name": "No results found",
+            "address": f"Try searching for '{search_query}' manually",
+            "type": place_type,
+            "placeholder": True  # Not a real place: keeps it out of the tool cache
+        }]
+    
+    return results
+
+
+@cached_tool("search_places", ttl=24 * 3600)
+def _search_places(city: str, place_type: str, query: Optional[str] = None) -> list[dict]:
     """
     Search for places using SerpStack API (Google Search).
     
@@ -30,163 +231,59 @@ def search_places(city: str, place_type: str, query: Optional[str] = None) -> li
     Returns:
         List of places with name, address, phone, rating, price_level
     """
-    import re
+    # Build search query
+    search_query = query if query else f"{place_type} in {city}"
     
     try:
-        # Build search query
-        if query:
-            search_query = query
-        else:
-            search_query = f"{place_type} in {city}"
-        
-        # SerpStack API parameters
-        params = {
-            "access_key": settings.serp_api_key,
-            "query": search_query,
-            "type": "web",
-            "num": 20,  # Request more results to get better data
-            "auto_location": 1, # Ensure auto-location is on
-            "google_domain": "google.co.in", # Use Google India for better local results
-            "gl": "in", # Country code for India
-            "hl": "en" # Language English
-        }
-        
-        response = requests.get(settings.serp_api_url, params=params, timeout=15)
+        response = _http_sync.get(settings.serp_api_url, params=_serp_params(search_query), timeout=15)
         response.raise_for_status()
         
-        data = response.json()
-        
-        # Check for API errors
-        if not data.get("request", {}).get("success", True):
-            error_info = data.get("error", {})
-            return [{"error": f"SerpStack API error: {error_info.get('info', 'Unknown error')}"}]
-        
-        results = []
-        
-        # Helper function to extract phone from text
-        def extract_phone(text):
-            """Extract phone number from text like '+91 99885 93333' or '99885 93333'"""
-            if not text:
-                return ""
-            # Match Indian phone patterns: +91 XXXXX XXXXX or XXXXX XXXXX
-            phone_match = re.search(r'(\+91\s*\d{5}\s*\d{5}|\d{5}\s*\d{5})', text)
-            return phone_match.group(1) if phone_match else ""
-        
-        # Create a mapping of place names to phone numbers from related_places
-        phone_mapping = {}
-        if "related_places" in data:
-            logger.info(f"Processing {len(data['related_places'])} related_places for phone extraction")
-            for place_obj in data["related_places"]:
-                place_text = place_obj.get("places", "")
-                phone = extract_phone(place_text)
-                if phone:
-                    place_title = place_obj.get("title", "").lower().strip()
-                    # Store phone number keyed by place title
-                    phone_mapping[place_title] = phone
-                    logger.info(f"Phone mapping: '{place_title}' -> '{phone}'")
-        
-        # PRIORITY 1: Parse local_results (has best structured data)
-        if "local_results" in data:
-            logger.info(f"Processing {len(data['local_results'])} local_results")
-            for place in data["local_results"][:10]:
-                place_name = place.get("title", "Unknown")
-                place_name_lower = place_name.lower().strip()
-                
-                # Try to get phone from related_places mapping first
-                phone = phone_mapping.get(place_name_lower, "")
-                
-                if not phone:
-                    logger.warning(f"No phone found in mapping for '{place_name_lower}'. Available keys: {list(phone_mapping.keys())}")
-                
-                # Fallback: try to extract from "type" field or address
-                if not phone:
-                    phone = extract_phone(place.get("type", ""))
-                if not phone:
-                    phone = extract_phone(place.get("address", ""))
-                
-                logger.info(f"Final phone for '{place_name}': '{phone}'")
-                
-                results.append({
-                    "name": place_name,
-                    "address": place.get("address", ""),
-                    "phone": phone,
-                    "rating": place.get("rating", None),
-                    "reviews_count": place.get("reviews", 0),
-                    "price_level": place.get("price", {}),
-                    "type": place_type,
-                    "extensions": place.get("extensions", {})
-                })
-        
-        # PRIORITY 2: Parse related_places (fallback if no local_results)
-        elif "related_places" in data:
-            for place_obj in data["related_places"][:10]:
-                place_text = place_obj.get("places", "")
-                phone = extract_phone(place_text)
-                
-                # Extract rating from text like "4.8(407)"
-                rating_match = re.search(r'(\d+\.\d+)\((\d+)\)', place_text)
-                rating = float(rating_match.group(1)) if rating_match else None
-                reviews = int(rating_match.group(2)) if rating_match else 0
-                
-                # Extract address (text between business info and "Closed/Open")
-                address_match = re.search(r'business\s*·\s*([^·]+?)(?:Closed|Open)', place_text)
-                address = address_match.group(1).strip() if address_match else ""
-                
-                results.append({
-                    "name": place_obj.get("title", "Unknown"),
-                    "address": address,
-                    "phone": phone,
-                    "rating": rating,
-                    "reviews_count": reviews,
-                    "price_level": {},
-                    "type": place_type,
-                    "extensions": {}
-                })
-        
-        # PRIORITY 3: Parse organic_results (last resort)
-        if not results and "organic_results" in data:
-            for idx, result in enumerate(data["organic_results"][:10], 1):
-                results.append({
-                    "name": result.get("title", "Unknown"),
-                    "address": result.get("snippet", "")[:100],
-                    "phone": "",
-                    "rating": None,
-                    "reviews_count": 0,
-                    "price_level": {},
-                    "type": place_type,
-                    "url": result.get("url", ""),
-                    "position": idx,
-                    "extensions": {}
-                })
-        
-        # If no results found
-        if not results:
-            return [{
-                "name": "No results found",
-                "address": f"Try searching for '{search_query}' manually",
-                "type": place_type
-            }]
+        return _parse_serp_results(response.json(), place_type, search_query)
+    
+    except httpx.HTTPError as e:
+        return [{"error": f"SerpStack API request error: {str(e)}"}]
+    except Exception as e:
+        return [{"error": f"SerpStack API error: {str(e)}"}]
+
+
+@cached_tool("search_places", ttl=24 * 3600)
+async def _asearch_places(city: str, place_type: str, query: Optional[str] = None) -> list[dict]:
+    """Async variant of search_places (pooled httpx.AsyncClient)."""
+    # Build search query
+    search_query = query if query else f"{place_type} in {city}"
+    
+    try:
+        response = await _http.get(settings.serp_api_url, params=_serp_params(search_query), timeout=15)
+        response.raise_for_status()
         
-        return results
+        return _parse_serp_results(response.json(), place_type, search_query)
     
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         return [{"error": f"SerpStack API request error: {str(e)}"}]
     except Exception as e:
         return [{"error": f"SerpStack API error: {str(e)}"}]
 
 
+# Dual sync/async tool: .invoke() runs the sync body, .ainvoke() the coroutine
+search_places = StructuredTool.from_function(
+    func=_search_places,
+    coroutine=_asearch_places,
+    name="search_places"
+)
+
+
 # ==========================================
 # Tavily Search Tool (Reviews & Sentiment)
 # ==========================================
 
-def get_tavily_tool():
+def get_tavily_tool(max_results: int = 5):
     """
     Returns Tavily search tool for reviews and ratings.
     Only initialize if API key is provided.
     """
     if settings.tavily_api_key:
         return TavilySearchResults(
-            max_results=5,
+            max_results=max_results,
             search_depth="advanced",
             include_answer=True,
             include_raw_content=False,
@@ -195,8 +292,35 @@ def get_tavily_tool():
     return None
 
 
-@tool
-def search_reviews(place_name: str, city: str) -> dict:
+def _review_query(place_name: str, city: str) -> str:
+    return f"{place_name} {city} reviews ratings customer feedback"
+
+
+def _tavily_fallback() -> dict:
+    return {
+        "source": "fallback",
+        "message": "Tavily API not configured, using basic analysis"
+    }
+
+
+def _tavily_payload(place_name: str, results) -> dict:
+    # TavilySearchResults returns repr(error) as a string instead of raising
+    if not isinstance(results, list):
+        return {
+            "source": "error",
+            "error": str(results)
+        }
+    
+    return {
+        "source": "tavily",
+        "place_name": place_name,
+        "results": results,
+        "summary": "Review data fetched successfully"
+    }
+
+
+@cached_tool("search_reviews", ttl=6 * 3600)
+def _search_reviews(place_name: str, city: str) -> dict:
     """
     Search for reviews and ratings of a specific place using Tavily.
     
@@ -211,20 +335,29 @@ def search_reviews(place_name: str, city: str) -> dict:
         tavily_tool = get_tavily_tool()
         
         if not tavily_tool:
-            return {
-                "source": "fallback",
-                "message": "Tavily API not configured, using basic analysis"
-            }
-        
-        query = f"{place_name} {city} reviews ratings customer feedback"
-        results = tavily_tool.invoke({"query": query})
+            return _tavily_fallback()
         
+        results = tavily_tool.invoke({"query": _review_query(place_name, city)})
+        return _tavily_payload(place_name, results)
+    
+    except Exception as e:
         return {
-            "source": "tavily",
-            "place_name": place_name,
-            "results": results,
-            "summary": "Review data fetched successfully"
+            "source": "error",
+            "error": str(e)
         }
+
+
+@cached_tool("search_reviews", ttl=6 * 3600)
+async def _asearch_reviews(place_name: str, city: str) -> dict:
+    """Async variant of search_reviews (non-blocking Tavily call)."""
+    try:
+        tavily_tool = get_tavily_tool()
+        
+        if not tavily_tool:
+            return _tavily_fallback()
+        
+        results = await tavily_tool.ainvoke({"query": _review_query(place_name, city)})
+        return _tavily_payload(place_name, results)
     
     except Exception as e:
         return {
@@ -233,47 +366,153 @@ def search_reviews(place_name: str, city: str) -> dict:
         }
 
 
-# ==========================================
-# Simulated Shop Contact Tool
-# ==========================================
+# Dual sync/async tool: .invoke() runs the sync body, .ainvoke() the coroutine
+search_reviews = StructuredTool.from_function(
+    func=_search_reviews,
+    coroutine=_asearch_reviews,
+    name="search_reviews"
+)
 
-@tool
-def contact_shop_simulation(
-    place_name: str,
-    place_type: str,
-    question_type: str,
-    user_budget: Optional[float] = None
-) -> str:
+
+# Minimum rapidfuzz partial_ratio for a Tavily result to count as being about a place
+_PLACE_MATCH_CUTOFF = 80
+
+
+def _batch_review_query(place_names: list[str], city: str) -> str:
+    return f"reviews ratings for {', '.join(place_names)} in {city}"
+
+
+def _bucket_by_place(place_names: list[str], results) -> dict[str, list]:
+    """Assign each Tavily result to the best fuzzy-matching place name (or drop it)."""
+    buckets = {name: [] for name in place_names}
+    if not isinstance(results, list):
+        return buckets
+    
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        text = " ".join(filter(None, (
+            result.get("title"),
+            result.get("url"),
+            (result.get("content") or "")[:200]
+        )))
+        match = process.extractOne(
+            text,
+            place_names,
+            scorer=fuzz.partial_ratio,
+            processor=utils.default_process,
+            score_cutoff=_PLACE_MATCH_CUTOFF
+        )
+        if match:
+            buckets[match[0]].append(result)
+    
+    return buckets
+
+
+@cached_tool("search_reviews_batch", ttl=6 * 3600)
+def _search_reviews_batch(place_names: list[str], city: str) -> dict[str, dict]:
     """
-    Simulate contacting a shop/business for information.
-    Uses LLM to generate realistic shop responses based on place type.
+    Search reviews for several places with a single Tavily call.
+    
+    Results are bucketed per place by fuzzy-matching their title/url/snippet;
+    places with no matching result fall back to an individual search_reviews call.
     
     Args:
-        place_name: Name of the business
-        place_type: Type (gym, restaurant, etc.)
-        question_type: What to ask (pricing, availability, features, negotiation)
-        user_budget: User's budget constraint if any
+        place_names: Names of the establishments
+        city: City location
     
     Returns:
-        Simulated shop response as JSON string
+        Dictionary mapping each place name to its search_reviews-style result
     """
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    from langchain_core.messages import SystemMessage, HumanMessage
+    if not place_names:
+        return {}
     
     try:
-        llm = ChatGoogleGenerativeAI(
-            model=settings.llm_model,
-            temperature=0.8,  # More creative for realistic responses
-            google_api_key=settings.google_api_key
-        )
+        tavily_tool = get_tavily_tool(max_results=min(20, 5 * len(place_names)))
         
-        # Craft realistic simulation prompt
-        system_prompt = f"""You are simulating a {place_type} business owner/manager responding to a customer inquiry.
-        Business name: {place_name}
+        if not tavily_tool:
+            return {name: _tavily_fallback() for name in place_names}
+        
+        results = tavily_tool.invoke({"query": _batch_review_query(place_names, city)})
+        buckets = _bucket_by_place(place_names, results)
+        
+        return {
+            name: _tavily_payload(name, matched) if matched else _search_reviews(name, city)
+            for name, matched in buckets.items()
+        }
+    
+    except Exception as e:
+        return {name: {"source": "error", "error": str(e)} for name in place_names}
+
+
+@cached_tool("search_reviews_batch", ttl=6 * 3600)
+async def _asearch_reviews_batch(place_names: list[str], city: str) -> dict[str, dict]:
+    """Async variant of search_reviews_batch (per-place fallbacks run concurrently)."""
+    if not place_names:
+        return {}
+    
+    try:
+        tavily_tool = get_tavily_tool(max_results=min(20, 5 * len(place_names)))
+        
+        if not tavily_tool:
+            return {name: _tavily_fallback() for name in place_names}
+        
+        results = await tavily_tool.ainvoke({"query": _batch_review_query(place_names, city)})
+        buckets = _bucket_by_place(place_names, results)
+        
+        unmatched = [name for name, matched in buckets.items() if not matched]
+        fallbacks = await asyncio.gather(*[_asearch_reviews(name, city) for name in unmatched])
+        fallback_map = dict(zip(unmatched, fallbacks))
+        
+        return {
+            name: _tavily_payload(name, matched) if matched else fallback_map[name]
+            for name, matched in buckets.items()
+        }
+    
+    except Exception as e:
+        return {name: {"source": "error", "error": str(e)} for name in place_names}
+
+
+# Dual sync/async tool: .invoke() runs the sync body, .ainvoke() the coroutine
+search_reviews_batch = StructuredTool.from_function(
+    func=_search_reviews_batch,
+    coroutine=_asearch_reviews_batch,
+    name="search_reviews_batch"
+)
+
+
+# ==========================================
+# Simulated Shop Contact Tool
+# ==========================================
+
+@lru_cache(maxsize=64)
+def _shop_system_prompt(place_type: str, place_name: str) -> str:
+    """
+    Realistic shop simulation system prompt, built once per (place_type, place_name).
+    
+    The place_type-specific instructions come first and the business name last,
+    so calls for shops of the same type share the longest possible prompt prefix
+    (better provider-side prefix cache hits).
+    """
+    return f"""You are simulating a {place_type} business owner/manager responding to a customer inquiry.
         Be professional, realistic, and provide specific details.
+        Business name: {place_name}
         """
-        
-        user_prompt = f"""Generate a realistic response for this inquiry:
+
+
+@cached_tool("contact_shop_simulation", ttl=3600)
+def _simulate_shop_response(
+    place_name: str,
+    place_type: str,
+    question_type: str,
+    user_budget: Optional[float] = None
+) -> str:
+    """LLM shop simulation; raises on failure so errors are never cached."""
+    from langchain_core.messages import SystemMessage, HumanMessage
+    
+    llm = _gemini(temperature=0.8)  # More creative for realistic responses
+    
+    user_prompt = f"""Generate a realistic response for this inquiry:
         
 Question type: {question_type}
 {'Customer budget: ₹' + str(user_budget) if user_budget else 'No budget mentioned'}
@@ -287,14 +526,38 @@ Provide response in this JSON format:
     "features": ["feature1", "feature2"] (if applicable)
 }}
 """
-        
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
-        ]
-        
-        response = llm.invoke(messages)
-        return response.content
+    
+    messages = [
+        SystemMessage(content=_shop_system_prompt(place_type, place_name)),
+        HumanMessage(content=user_prompt)
+    ]
+    
+    response = llm.invoke(messages)
+    return response.content
+
+
+@tool
+def contact_shop_simulation(
+    place_name: str,
+    place_type: str,
+    question_type: str,
+    user_budget: Optional[float] = None
+) -> str:
+    """
+    Simulate contacting a shop/business for information.
+    Uses LLM to generate realistic shop responses based on place type.
+    
+    Args:
+        place_name: Name of the business
+        place_type: Type (gym, restaurant, etc.)
+        question_type: What to ask (pricing, availability, features, negotiation)
+        user_budget: User's budget constraint if any
+    
+    Returns:
+        Simulated shop response as JSON string
+    """
+    try:
+        return _simulate_shop_response(place_name, place_type, question_type, user_budget)
     
     except Exception as e:
         # Fallback response
@@ -303,7 +566,7 @@ Provide response in this JSON format:
             "message": f"We'd be happy to help! Please call us for details about {question_type}.",
             "available": True
         }
-        return json.dumps(fallback)
+        return orjson.dumps(fallback).decode()
 
 
 # ==========================================
@@ -330,32 +593,36 @@ def compare_prices(places: list[dict], budget: Optional[float] = None) -> dict:
             "average_price": None
         }
         
+        names = []
         prices = []
         
+        # Single pass to pull out prices; the budget split is vectorized below
         for place in places:
-            # Check if place has pricing info
-            if "pricing_info" in place and place["pricing_info"]:
-                price = place["pricing_info"].get("monthly") or place["pricing_info"].get("base")
-                
-                if price:
-                    prices.append(price)
-                    
-                    if budget:
-                        if price <= budget:
-                            analysis["within_budget"].append({
-                                "name": place["name"],
-                                "price": price
-                            })
-                        else:
-                            analysis["above_budget"].append({
-                                "name": place["name"],
-                                "price": price
-                            })
-            else:
+            pricing_info = place.get("pricing_info")
+            if not pricing_info:
                 analysis["no_price_info"].append(place.get("name", "Unknown"))
+                continue
+            
+            price = pricing_info.get("monthly") or pricing_info.get("base")
+            if price:
+                names.append(place["name"])
+                prices.append(price)
         
-        if prices:
-            analysis["average_price"] = sum(prices) / len(prices)
+        arr = np.fromiter(prices, dtype=np.float64, count=len(prices))
+        
+        if arr.size:
+            analysis["average_price"] = float(arr.mean())
+            
+            if budget:
+                within = arr <= budget
+                analysis["within_budget"] = [
+                    {"name": name, "price": price}
+                    for name, price, ok in zip(names, prices, within) if ok
+                ]
+                analysis["above_budget"] = [
+                    {"name": name, "price": price}
+                    for name, price, ok in zip(names, prices, within) if not ok
+                ]
         
         return analysis
     
@@ -367,8 +634,96 @@ def compare_prices(places: list[dict], budget: Optional[float] = None) -> dict:
 # WebScraping.AI Tool (Review Extraction)
 # ==========================================
 
-@tool
-def fetch_reviews_webscraping_ai(query: str, limit: int = 3) -> list[str]:
+WEBSCRAPING_AI_URL = "https://api.webscraping.ai/html"
+
+
+@lru_cache(maxsize=1)
+def _get_tokenizer():
+    """Load the BPE tokenizer once (first call may download the encoding file)."""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def warm_tokenizer() -> None:
+    """Load the tokenizer ahead of the first request (call once at startup)."""
+    try:
+        _get_tokenizer()
+    except Exception as e:
+        # Not fatal: the first review fetch will retry the load off the event loop
+        logger.warning("Tokenizer warm-up failed: %s", e)
+
+
+# Per-service concurrency caps so a parallel fan-out doesn't trip rate limits
+_WSAI_SEM = asyncio.Semaphore(5)
+_GROQ_SEM = asyncio.Semaphore(8)
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRYABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+def _webscraping_params(query: str) -> dict:
+    """Build WebScraping.AI request params for a Google reviews search."""
+    search_query = f"reviews for {query}"
+    target_url = f"https://www.google.com/search?q={search_query}"
+    
+    return {
+        "api_key": settings.webscraping_ai_api_key,
+        "url": target_url,
+        "device": "desktop",
+        "proxy": "residential",
+        "js": "true" # Google needs JS
+    }
+
+
+def _html_to_text(html_content: str) -> str:
+    """Strip scripts/styles from the page and return token-truncated visible text."""
+    tree = LexborHTMLParser(html_content)
+    
+    # Remove script and style elements
+    for node in tree.css("script, style"):
+        node.decompose()
+        
+    # Get text
+    text = tree.body.text(separator=" ", strip=True) if tree.body else ""
+    
+    # Google Search results are noisy, but the reviews are usually in the main content.
+    # Truncate text to a token budget rather than a char count: noisy SERP text
+    # varies a lot in chars-per-token, and Groq latency/cost scale with tokens.
+    # Pre-slice chars (tokens are rarely > 8 chars) so we never tokenize the whole page.
+    text = text[:settings.review_max_input_tokens * 8]
+    enc = _get_tokenizer()
+    token_ids = enc.encode(text)
+    if len(token_ids) <= settings.review_max_input_tokens:
+        return text
+    return enc.decode(token_ids[:settings.review_max_input_tokens])
+
+
+def _review_extraction_prompt(query: str, limit: int, text_preview: str) -> str:
+    return (
+        f"Here is the text content of a Google Search page for '{query}'. "
+        f"Extract the top {limit} most relevant and detailed user reviews for this place. "
+        "Look for text that looks like user feedback, ratings, or comments. "
+        "Return a JSON object with a \"reviews\" list of strings. "
+        "Example: {\"reviews\": [\"Great coffee!\", \"Service was slow.\"]}. "
+        "If no reviews are found, return {\"reviews\": []}.\n\n"
+        f"PAGE TEXT:\n{text_preview}"
+    )
+
+
+def _parse_reviews(content: str, limit: int) -> list[str]:
+    """Read the reviews list from the JSON-mode reply {"reviews": [...]}."""
+    reviews = orjson.loads(content).get("reviews", [])
+    if isinstance(reviews, list):
+        return reviews[:limit]
+    return [str(reviews)]
+
+
+@cached_tool("fetch_reviews_webscraping_ai", ttl=24 * 3600)
+def _fetch_reviews(query: str, limit: int = 3) -> list[str]:
     """
     Fetch reviews for a shop using WebScraping.AI to get HTML and Groq to extract reviews.
     
@@ -384,79 +739,87 @@ def fetch_reviews_webscraping_ai(query: str, limit: int = 3) -> list[str]:
 
     try:
         # 1. Fetch HTML via WebScraping.AI
-        search_query = f"reviews for {query}"
-        target_url = f"https://www.google.com/search?q={search_query}"
-        
-        api_url = "https://api.webscraping.ai/html"
-        
-        params = {
-            "api_key": settings.webscraping_ai_api_key,
-            "url": target_url,
-            "device": "desktop",
-            "proxy": "residential",
-            "js": "true" # Google needs JS
-        }
-        
-        logger.info(f"Fetching HTML for '{query}' via WebScraping.AI...")
-        response = requests.get(api_url, params=params, timeout=60)
+        logger.info("Fetching HTML for '%s' via WebScraping.AI...", query)
+        response = _http_sync.get(WEBSCRAPING_AI_URL, params=_webscraping_params(query))
         
         if response.status_code != 200:
-            logger.error(f"WebScraping.AI Error: {response.status_code} - {response.text}")
+            logger.error("WebScraping.AI Error: %s - %s", response.status_code, response.text)
             return [f"Error fetching page: {response.status_code}"]
-            
-        html_content = response.text
         
-        # 2. Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html_content, "html.parser")
+        # 2. Parse HTML with selectolax (lexbor)
+        text_preview = _html_to_text(response.text)
+        
+        # 3. Use Groq to extract reviews
+        logger.info("Extracting reviews using Groq...")
+        msg = HumanMessage(content=_review_extraction_prompt(query, limit, text_preview))
+        ai_response = _groq(model=settings.extraction_model, json_mode=True).invoke([msg])
         
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
+        return _parse_reviews(ai_response.content, limit)
             
-        # Get text
-        text = soup.get_text(separator=" ", strip=True)
+    except Exception as e:
+        logger.error("Exception in fetch_reviews_webscraping_ai: %s", e)
+        return [f"Error: {str(e)}"]
+
+
+@cached_tool("fetch_reviews_webscraping_ai", ttl=24 * 3600)
+async def _afetch_reviews(query: str, limit: int = 3) -> list[str]:
+    """Async variant of fetch_reviews_webscraping_ai (pooled httpx + llm.ainvoke)."""
+    if not settings.webscraping_ai_api_key:
+        return ["Error: WebScraping.AI API Key not configured."]
+
+    try:
+        # 1. Fetch HTML via WebScraping.AI
+        logger.info("Fetching HTML for '%s' via WebScraping.AI...", query)
+        try:
+            response = await _afetch_html(query)
+        except httpx.HTTPStatusError as e:
+            response = e.response  # Retries exhausted, report the last status below
+        
+        if response.status_code != 200:
+            logger.error("WebScraping.AI Error: %s - %s", response.status_code, response.text)
+            return [f"Error fetching page: {response.status_code}"]
         
-        # Truncate text to fit in LLM context (approx 15k chars should be enough for top reviews)
-        # Google Search results are noisy, but the reviews are usually in the main content.
-        # We'll take the first 20,000 characters.
-        text_preview = text[:20000]
+        # 2. Parse HTML with selectolax (lexbor)
+        text_preview = await asyncio.to_thread(_html_to_text, response.text)
         
         # 3. Use Groq to extract reviews
         logger.info("Extracting reviews using Groq...")
-        llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
-            temperature=0,
-            api_key=settings.groq_api_key
-        )
-        
-        prompt = (
-            f"Here is the text content of a Google Search page for '{query}'. "
-            f"Extract the top {limit} most relevant and detailed user reviews for this place. "
-            "Look for text that looks like user feedback, ratings, or comments. "
-            "Return ONLY a raw JSON list of strings. Example: [\"Great coffee!\", \"Service was slow.\"]. "
-            "If no reviews are found, return [].\n\n"
-            f"PAGE TEXT:\n{text_preview}"
-        )
-        
-        msg = HumanMessage(content=prompt)
-        ai_response = llm.invoke([msg])
-        content = ai_response.content.strip()
+        msg = HumanMessage(content=_review_extraction_prompt(query, limit, text_preview))
+        async with _GROQ_SEM:
+            ai_response = await _groq(model=settings.extraction_model, json_mode=True).ainvoke([msg])
         
-        # Clean up markdown
-        if content.startswith("```json"):
-            content = content.replace("```json", "").replace("```", "")
-        elif content.startswith("```"):
-            content = content.replace("```", "")
-            
-        try:
-            reviews = json.loads(content)
-            if isinstance(reviews, list):
-                return reviews[:limit]
-            else:
-                return [str(reviews)]
-        except json.JSONDecodeError:
-            return [content]
+        return _parse_reviews(ai_response.content, limit)
             
     except Exception as e:
-        logger.error(f"Exception in fetch_reviews_webscraping_ai: {str(e)}")
+        logger.error("Exception in fetch_reviews_webscraping_ai: %s", e)
         return [f"Error: {str(e)}"]
+
+
+async def _afetch_html(query: str) -> httpx.Response:
+    """
+    GET the search page via WebScraping.AI.
+    
+    Gated by _WSAI_SEM and retried (3 attempts, jittered backoff) on 429/5xx and
+    transport errors. The semaphore is released while waiting between attempts.
+    """
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential_jitter(),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True
+    ):
+        with attempt:
+            async with _WSAI_SEM:
+                response = await _http.get(WEBSCRAPING_AI_URL, params=_webscraping_params(query))
+            if response.status_code in _RETRYABLE_STATUS:
+                response.raise_for_status()
+    return response
+
+
+# Dual sync/async tool: .invoke() runs the sync body, .ainvoke() the coroutine
+fetch_reviews_webscraping_ai = StructuredTool.from_function(
+    func=_fetch_reviews,
+    coroutine=_afetch_reviews,
+    name="fetch_reviews_webscraping_ai"
+)
+
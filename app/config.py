@@ -11,6 +11,7 @@ class Settings(BaseSettings):
     serp_api_key: str
     tavily_api_key: str = ""  # Optional
     webscraping_ai_api_key: str = "" # For AI-powered Review Extraction
+    redis_url: str = ""  # Optional: enables Redis caching of tool results
     
     # Application
     environment: Literal["development", "production"] = "development"
@@ -19,8 +20,10 @@ class Settings(BaseSettings):
     
     # LLM Settings
     llm_model: str = "llama-3.3-70b-versatile"  # Groq's best model
+    extraction_model: str = "llama-3.1-8b-instant"  # Fast model for review extraction
     llm_temperature: float = 0.7
     max_tokens: int = 2048
+    review_max_input_tokens: int = 6000  # Page-text token budget for review extraction
     
     # Agent Settings
     max_iterations: int = 3
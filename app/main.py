@@ -14,8 +14,10 @@ from app.models import (
     InitialQueryRequest
 )
 from app.agent.graph import negotiator_agent, get_thread_config, visualize_graph
-from app.agent.tools import search_places
+from app.agent.state import encode_field, get_serp_results, get_reviews
+from app.agent.tools import search_places, close_http_clients, warm_tokenizer
 from app.config import settings
+import asyncio
 import uuid
 import json
 import logging
@@ -44,6 +46,18 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def load_tokenizer():
+    """Load the review tokenizer up front so requests never pay for it"""
+    await asyncio.to_thread(warm_tokenizer)
+
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    """Release pooled keep-alive connections used by the tools"""
+    await close_http_clients()
+
+
 # ==========================================
 # HEALTH CHECK
 # ==========================================
@@ -76,7 +90,7 @@ async def search_endpoint(request: SearchRequest):
         logger.info(f"Search request: {request.city}, {request.place_type}")
         
         # Use SERP tool
-        results = search_places.invoke({
+        results = await search_places.ainvoke({
             "city": request.city,
             "place_type": request.place_type.value,
             "query": request.query
@@ -186,7 +200,7 @@ async def start_agent(request: InitialQueryRequest):
         logger.info(f"STEP 3: Searching SERPSTACK API with: Query='{final_query}'")
         
         # Call SERPSTACK (STEP 4 will execute in streaming)
-        results = search_places.invoke(search_params)
+        results = await search_places.ainvoke(search_params)
         
         if not results or any("error" in str(r) for r in results):
             logger.warning("SERPSTACK returned no results or error")
@@ -199,7 +213,7 @@ async def start_agent(request: InitialQueryRequest):
             "place_type": parsed_query.place_type,
             "user_intent": parsed_query.intent,
             "budget": None,
-            "serp_results": results,
+            "serp_results": encode_field(results),
             "thread_id": thread_id,
             "iteration": 0,
             "is_complete": False,
@@ -265,15 +279,15 @@ async def activate_agent(request: AgentActivationRequest):
             "place_type": request.search_results[0].type if request.search_results else "unknown",
             "user_intent": request.user_intent,
             "budget": request.budget,
-            "serp_results": serp_results,
-            "tavily_reviews": [],
+            "serp_results": encode_field(serp_results),
+            "tavily_reviews": encode_field([]),
             "human_approved": False,
             "human_notes": None,
             "route": "",
             "current_step": "start",
-            "initial_analysis": [],
+            "initial_analysis": encode_field([]),
             "shop_responses": [],
-            "refined_analysis": [],
+            "refined_analysis": encode_field([]),
             "iteration": 0,
             "recommendations": None,
             "is_complete": False,
@@ -341,9 +355,9 @@ async def approve_and_continue(request: HumanApprovalRequest):
             
             # If user modified results, update them
             if request.modified_results:
-                resume_input["serp_results"] = [
+                resume_input["serp_results"] = encode_field([
                     result.model_dump() for result in request.modified_results
-                ]
+                ])
         else:
             # User rejected, return error
             return AgentResponse(
@@ -450,17 +464,19 @@ async def stream_agent(thread_id: str):
             
             logger.info(f"Streaming for thread: {thread_id}")
             
+            # Decode the JSON-encoded SerpStack results once for this stream
+            serp_results = get_serp_results(state_snapshot.values)
+            
             # Send initial state info
             init_data = json.dumps({
                 "type": "init",
                 "city": state_snapshot.values.get("city"),
                 "place_type": state_snapshot.values.get("place_type"),
-                "serp_results_count": len(state_snapshot.values.get("serp_results", []))
+                "serp_results_count": len(serp_results)
             })
             yield f"data: {init_data}\n\n"
             
             # Show the SerpStack results first (from STEP 4)
-            serp_results = state_snapshot.values.get("serp_results", [])
             if serp_results:
                 results_preview = json.dumps({
                     "type": "data_fetched",
@@ -478,7 +494,7 @@ async def stream_agent(thread_id: str):
                     complete_data = json.dumps({
                         "type": "complete",
                         "recommendations": state_snapshot.values.get("recommendations", []),
-                        "all_places": state_snapshot.values.get("serp_results", []),
+                        "all_places": serp_results,
                         "iteration": state_snapshot.values.get("iteration", 0)
                     })
                     yield f"data: {complete_data}\n\n"
@@ -518,7 +534,7 @@ async def stream_agent(thread_id: str):
                     
                     # Review Extraction node
                     elif node_name == "review_extraction":
-                        reviews = node_state.get("reviews", {})
+                        reviews = get_reviews(node_state)
                         review_data = json.dumps({
                             "type": "reviews_fetched",
                             "count": len(reviews),
@@ -586,11 +602,12 @@ async def stream_agent(thread_id: str):
                 
                 # Check if interrupted for HITL
                 if current_state.next and current_state.next == ("human_review_node",):
+                    current_serp_results = get_serp_results(current_state.values)
                     interrupt_data = json.dumps({
                         "type": "interrupt",
                         "node": "human_review_node",
-                        "serp_results": current_state.values.get("serp_results", []),
-                        "places_count": len(current_state.values.get("serp_results", []))
+                        "serp_results": current_serp_results,
+                        "places_count": len(current_serp_results)
                     })
                     yield f"data: {interrupt_data}\n\n"
                     logger.info("HITL interrupt detected")
@@ -601,7 +618,7 @@ async def stream_agent(thread_id: str):
                     complete_data = json.dumps({
                         "type": "complete",
                         "recommendations": current_state.values.get("recommendations", []),
-                        "all_places": current_state.values.get("serp_results", []),
+                        "all_places": get_serp_results(current_state.values),
                         "iteration": current_state.values.get("iteration", 0)
                     })
                     yield f"data: {complete_data}\n\n"
@@ -709,7 +726,7 @@ async def quick_start_agent(
             query=user_preferences
         )
         
-        results = search_places.invoke({
+        results = await search_places.ainvoke({
             "city": search_req.city,
             "place_type": search_req.place_type.value,
             "query": search_req.query
@@ -0,0 +1,6 @@
+import os
+
+# Settings() is built at import time and requires these keys
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("SERP_API_KEY", "test")
+os.environ["REDIS_URL"] = ""  # Tool cache off: call the wrapped functions directly
@@ -0,0 +1,78 @@
+from app.agent import tools
+from app.agent.cache import make_cache_key, _is_cacheable
+import inspect
+
+
+CULT = "Cult Fit Koramangala"
+GOLDS = "Gold's Gym Indiranagar"
+
+CANNED_RESULTS = [
+    {
+        "url": "https://www.justdial.com/Bangalore/Cult-Fit-Koramangala",
+        "content": "Cult Fit Koramangala - 4.5 stars. Great trainers, clean equipment."
+    },
+    {
+        "url": "https://www.example.com/best-cafes-bangalore",
+        "content": "Top 10 cafes in Bangalore for working remotely."
+    }
+]
+
+
+class FakeTavily:
+    def __init__(self, results):
+        self.results = results
+        self.queries = []
+
+    def invoke(self, payload):
+        self.queries.append(payload["query"])
+        return self.results
+
+
+def test_bucket_by_place_matches_and_drops_unrelated():
+    buckets = tools._bucket_by_place([CULT, GOLDS], CANNED_RESULTS)
+
+    assert buckets[CULT] == [CANNED_RESULTS[0]]
+    assert buckets[GOLDS] == []
+
+
+def test_bucket_by_place_tolerates_error_string():
+    # TavilySearchResults returns repr(error) instead of a list on failure
+    buckets = tools._bucket_by_place([CULT], "HTTPError('429')")
+
+    assert buckets == {CULT: []}
+
+
+def test_search_reviews_batch_single_call_with_fallback(monkeypatch):
+    fake = FakeTavily(CANNED_RESULTS)
+    fallback_calls = []
+
+    def fake_search_reviews(place_name, city):
+        fallback_calls.append((place_name, city))
+        return {"source": "tavily", "place_name": place_name, "results": []}
+
+    monkeypatch.setattr(tools, "get_tavily_tool", lambda max_results=5: fake)
+    monkeypatch.setattr(tools, "_search_reviews", fake_search_reviews)
+
+    result = tools._search_reviews_batch([CULT, GOLDS], "Bangalore")
+
+    assert len(fake.queries) == 1
+    assert result[CULT]["source"] == "tavily"
+    assert result[CULT]["results"] == [CANNED_RESULTS[0]]
+    assert fallback_calls == [(GOLDS, "Bangalore")]
+    assert result[GOLDS]["place_name"] == GOLDS
+
+
+def test_batch_cache_key_keeps_place_name_case():
+    signature = inspect.signature(tools._search_reviews_batch.__wrapped__)
+
+    key_a = make_cache_key("search_reviews_batch", signature, ([CULT], "Bangalore"), {})
+    key_b = make_cache_key("search_reviews_batch", signature, ([CULT.lower()], "Bangalore"), {})
+
+    assert key_a != key_b
+
+
+def test_search_places_placeholder_is_not_cached():
+    placeholder = tools._parse_serp_results({}, "gym", "gym in Bangalore")
+
+    assert placeholder[0]["name"] == "No results found"
+    assert not _is_cacheable(placeholder)